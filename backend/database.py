@@ -3,6 +3,8 @@ import os
 from typing import Dict, List, Any
 from datetime import datetime
 
+from models import Category, Product, Sale
+
 DATA_FILE = "/app/data/data.json"
 
 DEFAULT_DATA = {
@@ -11,6 +13,12 @@ DEFAULT_DATA = {
     "sales": []
 }
 
+RECORD_TYPES = {
+    "categories": Category,
+    "products": Product,
+    "sales": Sale
+}
+
 class DataManager:
     _instance = None
     _data: Dict[str, List[Any]] = DEFAULT_DATA.copy()
@@ -27,7 +35,7 @@ class DataManager:
                 with open(DATA_FILE, 'r', encoding='utf-8') as f:
                     content = f.read().strip()
                     if content:
-                        self._data = json.loads(content)
+                        self._data = self._from_json(json.loads(content))
                     else:
                         self._data = DEFAULT_DATA.copy()
                         self._save_data()
@@ -42,101 +50,120 @@ class DataManager:
             print(f"Erro ao carregar dados: {e}")
             self._data = DEFAULT_DATA.copy()
     
+    def _from_json(self, raw: Dict) -> Dict[str, List[Any]]:
+        # Registros ficam em memória como objetos com __slots__ (ver models.py)
+        return {
+            key: [record_type.from_dict(item) for item in raw.get(key, [])]
+            for key, record_type in RECORD_TYPES.items()
+        }
+    
+    def _write_json(self, f):
+        # Grava um registro por vez para não montar todos os dicts de uma vez
+        f.write("{")
+        for n, key in enumerate(RECORD_TYPES):
+            f.write(",\n" if n else "\n")
+            f.write(f'  "{key}": [')
+            for i, record in enumerate(self._data.get(key, [])):
+                f.write(",\n    " if i else "\n    ")
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False))
+            f.write("\n  ]" if self._data.get(key) else "]")
+        f.write("\n}")
+    
     def _save_data(self):
         try:
             os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
             with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self._data, f, indent=2, ensure_ascii=False)
+                self._write_json(f)
         except Exception as e:
             print(f"Erro ao salvar dados: {e}")
     
-    def get_categories(self) -> List[Dict]:
+    def get_categories(self) -> List[Category]:
         return self._data.get("categories", [])
     
-    def get_products(self) -> List[Dict]:
+    def get_products(self) -> List[Product]:
         return self._data.get("products", [])
     
-    def get_sales(self) -> List[Dict]:
+    def get_sales(self) -> List[Sale]:
         return self._data.get("sales", [])
     
-    def add_category(self, category: Dict) -> Dict:
+    def add_category(self, category: Category) -> Category:
         categories = self._data.get("categories", [])
         categories.append(category)
         self._data["categories"] = categories
         self._save_data()
         return category
     
-    def add_product(self, product: Dict) -> Dict:
+    def add_product(self, product: Product) -> Product:
         products = self._data.get("products", [])
         products.append(product)
         self._data["products"] = products
         self._save_data()
         return product
     
-    def add_sale(self, sale: Dict) -> Dict:
+    def add_sale(self, sale: Sale) -> Sale:
         sales = self._data.get("sales", [])
         sales.append(sale)
         self._data["sales"] = sales
         self._save_data()
         return sale
     
-    def add_categories_bulk(self, categories: List[Dict]) -> int:
+    def add_categories_bulk(self, categories: List[Category]) -> int:
         # Evita duplicatas
-        existing_ids = {c.get("id") for c in self._data.get("categories", [])}
-        new_cats = [c for c in categories if c.get("id") not in existing_ids]
+        existing_ids = {c.id for c in self._data.get("categories", [])}
+        new_cats = [c for c in categories if c.id not in existing_ids]
         self._data["categories"].extend(new_cats)
         self._save_data()
         return len(new_cats)
     
-    def add_products_bulk(self, products: List[Dict]) -> int:
+    def add_products_bulk(self, products: List[Product]) -> int:
         # Evita duplicatas
-        existing_ids = {p.get("id") for p in self._data.get("products", [])}
-        new_prods = [p for p in products if p.get("id") not in existing_ids]
+        existing_ids = {p.id for p in self._data.get("products", [])}
+        new_prods = [p for p in products if p.id not in existing_ids]
         self._data["products"].extend(new_prods)
         self._save_data()
         return len(new_prods)
     
-    def add_sales_bulk(self, sales: List[Dict]) -> int:
+    def add_sales_bulk(self, sales: List[Sale]) -> int:
         # Evita duplicatas
-        existing_ids = {s.get("id") for s in self._data.get("sales", [])}
-        new_sales = [s for s in sales if s.get("id") not in existing_ids]
+        existing_ids = {s.id for s in self._data.get("sales", [])}
+        new_sales = [s for s in sales if s.id not in existing_ids]
         self._data["sales"].extend(new_sales)
         self._save_data()
         return len(new_sales)
     
     def delete_product(self, product_id: int):
         products = self._data.get("products", [])
-        self._data["products"] = [p for p in products if p.get("id") != product_id]
+        self._data["products"] = [p for p in products if p.id != product_id]
         self._save_data()
     
-    def update_sale(self, sale_id: int, updated_sale: Dict) -> Dict:
+    def update_sale(self, sale_id: int, updated_sale: Dict) -> Sale:
         sales = self._data.get("sales", [])
         for i, sale in enumerate(sales):
-            if sale.get("id") == sale_id:
+            if sale.id == sale_id:
                 # Preserva o product_id original
-                updated = {**sale, **updated_sale}
-                updated['product_id'] = sale.get('product_id')
-                sales[i] = updated
+                updated = {**sale.to_dict(), **updated_sale}
+                updated['product_id'] = sale.product_id
+                sales[i] = Sale.from_dict(updated)
                 self._data["sales"] = sales
                 self._save_data()
                 return sales[i]
         return None
     
-    def update_product(self, product_id: int, updated_product: Dict) -> Dict:
+    def update_product(self, product_id: int, updated_product: Dict) -> Product:
         products = self._data.get("products", [])
         for i, product in enumerate(products):
-            if product.get("id") == product_id:
-                products[i] = {**product, **updated_product}
+            if product.id == product_id:
+                products[i] = Product.from_dict({**product.to_dict(), **updated_product})
                 self._data["products"] = products
                 self._save_data()
                 return products[i]
         return None
     
-    def update_category(self, category_id: int, updated_category: Dict) -> Dict:
+    def update_category(self, category_id: int, updated_category: Dict) -> Category:
         categories = self._data.get("categories", [])
         for i, category in enumerate(categories):
-            if category.get("id") == category_id:
-                categories[i] = {**category, **updated_category}
+            if category.id == category_id:
+                categories[i] = Category.from_dict({**category.to_dict(), **updated_category})
                 self._data["categories"] = categories
                 self._save_data()
                 return categories[i]
@@ -145,7 +172,7 @@ class DataManager:
     def get_dashboard_stats(self) -> Dict:
         sales = self._data.get("sales", [])
         total_sales = len(sales)
-        total_revenue = sum(s.get("total_price", 0) for s in sales)
+        total_revenue = sum(s.total_price for s in sales)
         return {
             "total_sales_count": total_sales,
             "total_revenue": total_revenue
@@ -1,22 +1,52 @@
+import sys
+from typing import Optional
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Marcas, nomes de categoria e datas se repetem em milhões de linhas;
+    # internar faz todas as linhas apontarem para a mesma string.
+    # Quem cria o registro já entrega str (ou None); não há conversão aqui.
+    return sys.intern(value) if value is not None else None
+
+
 class Category:
+    __slots__ = ("id", "name")
+
     def __init__(self, id: int, name: str):
         self.id = id
-        self.name = name
-    
+        self.name = _intern(name)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(id=data["id"], name=data.get("name", ""))
+
     def to_dict(self):
         return {"id": self.id, "name": self.name}
 
 
 class Product:
-    def __init__(self, id: int, name: str, description: str = "", price: float = 0.0, 
+    __slots__ = ("id", "name", "description", "price", "brand", "category_id")
+
+    def __init__(self, id: int, name: str, description: str = "", price: float = 0.0,
                  brand: str = "", category_id: int = 0):
         self.id = id
         self.name = name
         self.description = description
         self.price = price
-        self.brand = brand
+        self.brand = _intern(brand)
         self.category_id = category_id
-    
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            id=data["id"],
+            name=data.get("name", ""),
+            description=data.get("description", ""),
+            price=data.get("price", 0.0),
+            brand=data.get("brand", ""),
+            category_id=data.get("category_id", 0)
+        )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -29,13 +59,25 @@ class Product:
 
 
 class Sale:
+    __slots__ = ("id", "product_id", "quantity", "total_price", "date")
+
     def __init__(self, id: int, product_id: int, quantity: int, total_price: float, date: str):
         self.id = id
         self.product_id = product_id
         self.quantity = quantity
         self.total_price = total_price
-        self.date = date
-    
+        self.date = _intern(date)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            id=data["id"],
+            product_id=data["product_id"],
+            quantity=data["quantity"],
+            total_price=data["total_price"],
+            date=data["date"]
+        )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -43,4 +85,4 @@ class Sale:
             "quantity": self.quantity,
             "total_price": self.total_price,
             "date": self.date
-        }
\ No newline at end of file
+        }
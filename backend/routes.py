@@ -1,6 +1,9 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import StreamingResponse, JSONResponse
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import io
 from datetime import datetime
 from openpyxl import Workbook
@@ -13,6 +16,37 @@ import schemas
 
 router = APIRouter()
 
+PARQUET_BATCH_SIZE = 100_000
+
+PARQUET_SCHEMAS = {
+    "categories": pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string())
+    ]),
+    "products": pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+        ("price", pa.float64()),
+        ("category_id", pa.int64()),
+        ("brand", pa.string())
+    ]),
+    "sales": pa.schema([
+        ("id", pa.int64()),
+        ("product_id", pa.int64()),
+        ("quantity", pa.int64()),
+        ("total_price", pa.float64()),
+        ("date", pa.string())
+    ])
+}
+
+
+def parse_sale_date(value):
+    try:
+        return pd.to_datetime(value).strftime('%Y-%m-%d')
+    except:
+        return None
+
 
 # Upload CSV
 @router.post("/upload/csv/{file_type}")
@@ -27,10 +61,10 @@ async def upload_csv(file_type: str, file: UploadFile = File(...)):
         if file_type == "categories":
             categories_data = []
             for _, row in df.iterrows():
-                cat = {
-                    "id": int(row['id']),
-                    "name": str(row['name'])
-                }
+                cat = models.Category(
+                    id=int(row['id']),
+                    name=str(row['name'])
+                )
                 categories_data.append(cat)
             count = db.add_categories_bulk(categories_data)
             return {"message": "Importação de Categorias concluída", "inserted": count}
@@ -38,14 +72,14 @@ async def upload_csv(file_type: str, file: UploadFile = File(...)):
         elif file_type == "products":
             products_data = []
             for _, row in df.iterrows():
-                prod = {
-                    "id": int(row['id']),
-                    "name": str(row['name']),
-                    "description": str(row.get('description', '')),
-                    "price": float(row['price']),
-                    "category_id": int(row['category_id']),
-                    "brand": str(row.get('brand', ''))
-                }
+                prod = models.Product(
+                    id=int(row['id']),
+                    name=str(row['name']),
+                    description=str(row.get('description', '')),
+                    price=float(row['price']),
+                    category_id=int(row['category_id']),
+                    brand=str(row.get('brand', ''))
+                )
                 products_data.append(prod)
             count = db.add_products_bulk(products_data)
             return {"message": "Importação de Produtos concluída", "inserted": count}
@@ -53,18 +87,17 @@ async def upload_csv(file_type: str, file: UploadFile = File(...)):
         elif file_type == "sales":
             sales_data = []
             for _, row in df.iterrows():
-                try:
-                    sale_date = pd.to_datetime(row['date']).strftime('%Y-%m-%d')
-                except:
+                sale_date = parse_sale_date(row['date'])
+                if sale_date is None:
                     continue
                 
-                sale = {
-                    "id": int(row['id']),
-                    "product_id": int(row['product_id']),
-                    "quantity": int(row['quantity']),
-                    "total_price": float(row['total_price']),
-                    "date": sale_date
-                }
+                sale = models.Sale(
+                    id=int(row['id']),
+                    product_id=int(row['product_id']),
+                    quantity=int(row['quantity']),
+                    total_price=float(row['total_price']),
+                    date=sale_date
+                )
                 sales_data.append(sale)
             count = db.add_sales_bulk(sales_data)
             return {"message": "Importação de Vendas concluída", "inserted": count}
@@ -76,6 +109,166 @@ async def upload_csv(file_type: str, file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 
+# Colunas que podem faltar ou vir nulas; as demais são obrigatórias.
+# Datas nulas descartam a venda, como no CSV.
+PARQUET_OPTIONAL_COLUMNS = {"description", "brand"}
+PARQUET_NULLABLE_COLUMNS = PARQUET_OPTIONAL_COLUMNS | {"date"}
+
+
+def _is_text(data_type: pa.DataType) -> bool:
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def _is_number(data_type: pa.DataType) -> bool:
+    return (pa.types.is_integer(data_type) or pa.types.is_floating(data_type)
+            or pa.types.is_decimal(data_type))
+
+
+def _parquet_accepts(field: pa.Field, source_type: pa.DataType) -> bool:
+    # Colunas categóricas (dictionary) valem pelo tipo dos valores
+    if pa.types.is_dictionary(source_type):
+        source_type = source_type.value_type
+    # Coluna toda nula: quem decide é a checagem de nulos por lote
+    if pa.types.is_null(source_type):
+        return True
+    if field.name == "date":
+        return (_is_text(source_type) or pa.types.is_date(source_type)
+                or pa.types.is_timestamp(source_type))
+    if pa.types.is_string(field.type):
+        return _is_text(source_type) or _is_number(source_type)
+    return _is_number(source_type)
+
+
+def _parquet_schema_error(file_type: str, schema: pa.Schema):
+    for field in PARQUET_SCHEMAS[file_type]:
+        if field.name not in schema.names:
+            if field.name in PARQUET_OPTIONAL_COLUMNS:
+                continue
+            return f"Coluna obrigatória ausente: {field.name}"
+        if not _parquet_accepts(field, schema.field(field.name).type):
+            return f"Tipo inválido na coluna {field.name}: {schema.field(field.name).type}"
+    return None
+
+
+def _parquet_null_column(batch):
+    for name in batch.schema.names:
+        if name not in PARQUET_NULLABLE_COLUMNS and batch.column(name).null_count:
+            return name
+    return None
+
+
+def _parquet_column(batch, name):
+    column = batch.column(name)
+    if pa.types.is_dictionary(column.type):
+        return column.dictionary_decode()
+    return column
+
+
+def _parquet_sale_dates(column):
+    # Colunas de data nativas são formatadas direto no Arrow; texto é
+    # convertido uma vez por valor distinto, com a mesma regra do CSV
+    if pa.types.is_dictionary(column.type) and _is_text(column.type.value_type):
+        encoded = column
+    else:
+        if pa.types.is_dictionary(column.type):
+            column = column.dictionary_decode()
+        if pa.types.is_timestamp(column.type):
+            return pc.strftime(column, format='%Y-%m-%d').to_pylist()
+        if pa.types.is_date(column.type):
+            return pc.strftime(column.cast(pa.timestamp('s')), format='%Y-%m-%d').to_pylist()
+        encoded = pc.dictionary_encode(column.cast(pa.string()))
+    parsed = [parse_sale_date(v) for v in encoded.dictionary.to_pylist()]
+    return [parsed[i] if i is not None else None for i in encoded.indices.to_pylist()]
+
+
+def _parquet_text(batch, name):
+    if name not in batch.schema.names:
+        return [''] * batch.num_rows
+    return [v if v is not None else '' for v in _parquet_column(batch, name).cast(pa.string()).to_pylist()]
+
+
+def _parquet_records(file_type: str, batch):
+    if file_type == "categories":
+        return [
+            models.Category(id=id, name=name)
+            for id, name in zip(
+                _parquet_column(batch, 'id').cast(pa.int64()).to_pylist(),
+                _parquet_column(batch, 'name').cast(pa.string()).to_pylist()
+            )
+        ]
+
+    if file_type == "products":
+        return [
+            models.Product(id=id, name=name, description=description, price=price,
+                           category_id=category_id, brand=brand)
+            for id, name, description, price, category_id, brand in zip(
+                _parquet_column(batch, 'id').cast(pa.int64()).to_pylist(),
+                _parquet_column(batch, 'name').cast(pa.string()).to_pylist(),
+                _parquet_text(batch, 'description'),
+                _parquet_column(batch, 'price').cast(pa.float64()).to_pylist(),
+                _parquet_column(batch, 'category_id').cast(pa.int64()).to_pylist(),
+                _parquet_text(batch, 'brand')
+            )
+        ]
+
+    return [
+        models.Sale(id=id, product_id=product_id, quantity=quantity,
+                    total_price=total_price, date=date)
+        for id, product_id, quantity, total_price, date in zip(
+            _parquet_column(batch, 'id').cast(pa.int64()).to_pylist(),
+            _parquet_column(batch, 'product_id').cast(pa.int64()).to_pylist(),
+            _parquet_column(batch, 'quantity').cast(pa.int64()).to_pylist(),
+            _parquet_column(batch, 'total_price').cast(pa.float64()).to_pylist(),
+            _parquet_sale_dates(batch.column('date'))
+        )
+        if date is not None
+    ]
+
+
+# Upload Parquet
+@router.post("/upload/parquet/{file_type}")
+def upload_parquet(file_type: str, file: UploadFile = File(...)):
+    if file_type not in PARQUET_SCHEMAS:
+        raise HTTPException(status_code=400, detail="Tipo inválido. Use: categories, products, sales")
+
+    try:
+        parquet_file = pq.ParquetFile(file.file)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Arquivo inválido ou corrompido.")
+
+    schema_error = _parquet_schema_error(file_type, parquet_file.schema_arrow)
+    if schema_error:
+        raise HTTPException(status_code=400, detail=schema_error)
+    columns = [name for name in PARQUET_SCHEMAS[file_type].names if name in parquet_file.schema_arrow.names]
+
+    try:
+        # Lê um lote por vez para não materializar o arquivo inteiro
+        records = []
+        for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_SIZE, columns=columns):
+            null_column = _parquet_null_column(batch)
+            if null_column:
+                raise HTTPException(status_code=400, detail=f"Valores nulos na coluna obrigatória: {null_column}")
+            try:
+                records.extend(_parquet_records(file_type, batch))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise HTTPException(status_code=400, detail=f"Valor inválido no arquivo: {str(e)}")
+
+        if file_type == "categories":
+            count = db.add_categories_bulk(records)
+            return {"message": "Importação de Categorias concluída", "inserted": count}
+        elif file_type == "products":
+            count = db.add_products_bulk(records)
+            return {"message": "Importação de Produtos concluída", "inserted": count}
+        else:
+            count = db.add_sales_bulk(records)
+            return {"message": "Importação de Vendas concluída", "inserted": count}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+
 @router.get("/products", response_model=list[schemas.ProductResponse])
 def list_products():
     products = db.get_products()
@@ -87,20 +280,20 @@ def create_product(product: schemas.ProductCreate):
     categories = db.get_categories()
     if not categories:
         raise HTTPException(status_code=400, detail="É necessário ter pelo menos uma categoria cadastrada antes de adicionar produtos")
-    if not any(c.get('id') == product.category_id for c in categories):
+    if not any(c.id == product.category_id for c in categories):
         raise HTTPException(status_code=400, detail="Categoria não encontrada")
     
     products = db.get_products()
-    new_id = max([p.get('id', 0) for p in products], default=0) + 1
+    new_id = max([p.id for p in products], default=0) + 1
     product_dict = product.dict()
     product_dict['id'] = new_id
-    return db.add_product(product_dict)
+    return db.add_product(models.Product.from_dict(product_dict))
 
 
 @router.put("/products/{product_id}", response_model=schemas.ProductResponse)
 def update_product(product_id: int, product: schemas.ProductCreate):
     categories = db.get_categories()
-    if not any(c.get('id') == product.category_id for c in categories):
+    if not any(c.id == product.category_id for c in categories):
         raise HTTPException(status_code=400, detail="Categoria não encontrada")
     
     product_dict = product.dict()
@@ -125,10 +318,10 @@ def list_categories():
 @router.post("/categories", response_model=schemas.CategoryResponse)
 def create_category(category: schemas.CategoryCreate):
     categories = db.get_categories()
-    new_id = max([c.get('id', 0) for c in categories], default=0) + 1
+    new_id = max([c.id for c in categories], default=0) + 1
     category_dict = category.dict()
     category_dict['id'] = new_id
-    return db.add_category(category_dict)
+    return db.add_category(models.Category.from_dict(category_dict))
 
 
 @router.put("/categories/{category_id}", response_model=schemas.CategoryResponse)
@@ -148,14 +341,14 @@ def list_sales():
 @router.post("/sales", response_model=schemas.SaleResponse)
 def create_sale(sale: schemas.SaleCreate):
     products = db.get_products()
-    if not any(p.get('id') == sale.product_id for p in products):
+    if not any(p.id == sale.product_id for p in products):
         raise HTTPException(status_code=400, detail="Produto não encontrado")
 
     sales = db.get_sales()
-    new_id = max([s.get('id', 0) for s in sales], default=0) + 1
+    new_id = max([s.id for s in sales], default=0) + 1
     sale_dict = sale.dict()
     sale_dict['id'] = new_id
-    return db.add_sale(sale_dict)
+    return db.add_sale(models.Sale.from_dict(sale_dict))
 
 
 @router.put("/sales/{sale_id}", response_model=schemas.SaleResponse)
@@ -241,12 +434,12 @@ def export_xlsx():
             cell.border = border
         
         for row_idx, prod in enumerate(products, 2):
-            ws_products.cell(row=row_idx, column=1).value = prod.get('id')
-            ws_products.cell(row=row_idx, column=2).value = prod.get('name')
-            ws_products.cell(row=row_idx, column=3).value = prod.get('description', '')
-            ws_products.cell(row=row_idx, column=4).value = prod.get('price', 0)
-            ws_products.cell(row=row_idx, column=5).value = prod.get('brand', '')
-            ws_products.cell(row=row_idx, column=6).value = prod.get('category_id')
+            ws_products.cell(row=row_idx, column=1).value = prod.id
+            ws_products.cell(row=row_idx, column=2).value = prod.name
+            ws_products.cell(row=row_idx, column=3).value = prod.description
+            ws_products.cell(row=row_idx, column=4).value = prod.price
+            ws_products.cell(row=row_idx, column=5).value = prod.brand
+            ws_products.cell(row=row_idx, column=6).value = prod.category_id
             
             for col in range(1, 7):
                 cell = ws_products.cell(row=row_idx, column=col)
@@ -276,8 +469,8 @@ def export_xlsx():
             cell.border = border
         
         for row_idx, cat in enumerate(categories, 2):
-            ws_categories.cell(row=row_idx, column=1).value = cat.get('id')
-            ws_categories.cell(row=row_idx, column=2).value = cat.get('name')
+            ws_categories.cell(row=row_idx, column=1).value = cat.id
+            ws_categories.cell(row=row_idx, column=2).value = cat.name
             
             for col in range(1, 3):
                 cell = ws_categories.cell(row=row_idx, column=col)
@@ -300,11 +493,11 @@ def export_xlsx():
             cell.border = border
         
         for row_idx, sale in enumerate(sales, 2):
-            ws_sales.cell(row=row_idx, column=1).value = sale.get('id')
-            ws_sales.cell(row=row_idx, column=2).value = sale.get('product_id')
-            ws_sales.cell(row=row_idx, column=3).value = sale.get('quantity')
-            ws_sales.cell(row=row_idx, column=4).value = sale.get('total_price', 0)
-            ws_sales.cell(row=row_idx, column=5).value = sale.get('date')
+            ws_sales.cell(row=row_idx, column=1).value = sale.id
+            ws_sales.cell(row=row_idx, column=2).value = sale.product_id
+            ws_sales.cell(row=row_idx, column=3).value = sale.quantity
+            ws_sales.cell(row=row_idx, column=4).value = sale.total_price
+            ws_sales.cell(row=row_idx, column=5).value = sale.date
             
             for col in range(1, 6):
                 cell = ws_sales.cell(row=row_idx, column=col)
@@ -335,7 +528,7 @@ def export_products_csv():
     
     csv_data = "id,name,description,price,category_id,brand\n"
     for prod in products:
-        csv_data += f"{prod.get('id')},{prod.get('name')},\"{prod.get('description', '')}\",{prod.get('price')},{prod.get('category_id')},{prod.get('brand', '')}\n"
+        csv_data += f"{prod.id},{prod.name},\"{prod.description}\",{prod.price},{prod.category_id},{prod.brand}\n"
     
     output = io.BytesIO(csv_data.encode('utf-8'))
     headers = {"Content-Disposition": "attachment; filename=produtos.csv"}
@@ -349,13 +542,75 @@ def export_sales_csv():
     
     csv_data = "id,product_id,quantity,total_price,date\n"
     for sale in sales:
-        csv_data += f"{sale.get('id')},{sale.get('product_id')},{sale.get('quantity')},{sale.get('total_price')},{sale.get('date')}\n"
+        csv_data += f"{sale.id},{sale.product_id},{sale.quantity},{sale.total_price},{sale.date}\n"
     
     output = io.BytesIO(csv_data.encode('utf-8'))
     headers = {"Content-Disposition": "attachment; filename=vendas.csv"}
     return StreamingResponse(output, media_type="text/csv", headers=headers)
 
 
+class _ParquetStream(io.RawIOBase):
+    # Destino do ParquetWriter que entrega os bytes por row group
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _iter_parquet(records, schema: pa.Schema):
+    sink = _ParquetStream()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for start in range(0, len(records), PARQUET_BATCH_SIZE):
+            chunk = records[start:start + PARQUET_BATCH_SIZE]
+            batch = pa.record_batch(
+                [pa.array([getattr(r, field.name) for r in chunk], type=field.type) for field in schema],
+                schema=schema
+            )
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _parquet_response(file_type: str, records, filename: str):
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    return StreamingResponse(
+        _iter_parquet(records, PARQUET_SCHEMAS[file_type]),
+        media_type="application/vnd.apache.parquet",
+        headers=headers
+    )
+
+
+# Exportar Parquet
+@router.get("/reports/export-categories.parquet")
+def export_categories_parquet():
+    return _parquet_response("categories", db.get_categories(), "categorias.parquet")
+
+
+@router.get("/reports/export-products.parquet")
+def export_products_parquet():
+    return _parquet_response("products", db.get_products(), "produtos.parquet")
+
+
+@router.get("/reports/export-sales.parquet")
+def export_sales_parquet():
+    return _parquet_response("sales", db.get_sales(), "vendas.parquet")
+
+
 # Postman
 @router.get("/postman/collection")
 def postman_collection():
@@ -377,7 +632,13 @@ def postman_collection():
             {"name": "Upload CSV - Products", "request": {"method": "POST", "url": "{{baseUrl}}/upload/csv/products"}},
             {"name": "Upload CSV - Categories", "request": {"method": "POST", "url": "{{baseUrl}}/upload/csv/categories"}},
             {"name": "Upload CSV - Sales", "request": {"method": "POST", "url": "{{baseUrl}}/upload/csv/sales"}},
-            {"name": "Export XLSX", "request": {"method": "GET", "url": "{{baseUrl}}/reports/export.xlsx"}}
+            {"name": "Upload Parquet - Products", "request": {"method": "POST", "url": "{{baseUrl}}/upload/parquet/products"}},
+            {"name": "Upload Parquet - Categories", "request": {"method": "POST", "url": "{{baseUrl}}/upload/parquet/categories"}},
+            {"name": "Upload Parquet - Sales", "request": {"method": "POST", "url": "{{baseUrl}}/upload/parquet/sales"}},
+            {"name": "Export XLSX", "request": {"method": "GET", "url": "{{baseUrl}}/reports/export.xlsx"}},
+            {"name": "Export Products Parquet", "request": {"method": "GET", "url": "{{baseUrl}}/reports/export-products.parquet"}},
+            {"name": "Export Categories Parquet", "request": {"method": "GET", "url": "{{baseUrl}}/reports/export-categories.parquet"}},
+            {"name": "Export Sales Parquet", "request": {"method": "GET", "url": "{{baseUrl}}/reports/export-sales.parquet"}}
         ]
     }
 